@@ -19,6 +19,10 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import mimetypes
 
+# Media extensions recognised in video folders
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.m4a', '.aac'})
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.webm', '.mkv', '.avi', '.mov'})
+
 class ContentScanner:
     """Separate class for scanning content without HTTP request context."""
     
@@ -32,18 +36,21 @@ class ContentScanner:
         if not self.downloads_dir.exists():
             return content_list
         
-        # Iterate through channel directories
-        for channel_dir in self.downloads_dir.iterdir():
-            if not channel_dir.is_dir() or channel_dir.name.startswith('.'):
-                continue
-            
-            channel_name = channel_dir.name
+        # Iterate through channel directories (scandir caches the entry type,
+        # so no extra stat is needed per directory)
+        with os.scandir(self.downloads_dir) as channel_entries:
+            channel_dirs = [entry for entry in channel_entries
+                            if entry.is_dir() and not entry.name.startswith('.')]
+        
+        for channel_entry in channel_dirs:
+            channel_name = channel_entry.name
             
             # Iterate through video folders in each channel
-            for video_dir in channel_dir.iterdir():
-                if not video_dir.is_dir() or video_dir.name.startswith('.'):
-                    continue
-                
+            with os.scandir(channel_entry.path) as video_entries:
+                video_dirs = [Path(entry.path) for entry in video_entries
+                              if entry.is_dir() and not entry.name.startswith('.')]
+            
+            for video_dir in video_dirs:
                 content_info = self.analyze_video_folder(video_dir, channel_name)
                 if content_info:
                     content_list.append(content_info)
@@ -70,32 +77,32 @@ class ContentScanner:
                 'preferredLanguage': None
             }
             
-            # Check for summary files
-            content_summary_dir = video_dir / "content_summary"
-            if content_summary_dir.exists():
-                content_info.update(self.read_summary_info(content_summary_dir))
-            
-            # Find media files
-            media_extensions = {
-                'audio': ['.mp3', '.m4a', '.aac'],
-                'video': ['.mp4', '.webm', '.mkv', '.avi', '.mov']
-            }
-            
-            for file_path in video_dir.iterdir():
-                if file_path.is_file():
-                    ext = file_path.suffix.lower()
+            # Find media files in a single pass; the summary directory is detected
+            # here too instead of with a separate exists() check
+            with os.scandir(video_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Check for summary files
+                        if entry.name == "content_summary":
+                            content_info.update(self.read_summary_info(Path(entry.path)))
+                        continue
+                    
+                    if not entry.is_file():
+                        continue
+                    
+                    ext = os.path.splitext(entry.name)[1].lower()
                     
                     # Check for audio files
-                    if ext in media_extensions['audio']:
-                        content_info['audioFile'] = file_path.name
+                    if ext in AUDIO_EXTENSIONS:
+                        content_info['audioFile'] = entry.name
                     
                     # Check for video files
-                    elif ext in media_extensions['video']:
-                        content_info['videoFile'] = file_path.name
+                    elif ext in VIDEO_EXTENSIONS:
+                        content_info['videoFile'] = entry.name
                     
                     # Check for info.json metadata
-                    elif file_path.name.endswith('.info.json'):
-                        metadata = self.read_metadata(file_path)
+                    elif entry.name.endswith('.info.json'):
+                        metadata = self.read_metadata(Path(entry.path))
                         if metadata:
                             content_info.update(metadata)
             
@@ -392,7 +399,8 @@ class ContentHandler(BaseHTTPRequestHandler):
             host = self.headers.get('Host', 'localhost:8080')
             base_url = f"http://{host}"
             
-            generator = RSSGenerator(self.downloads_dir, base_url)
+            # A GET must not write into the library; the harvester maintains the sidecar caches
+            generator = RSSGenerator(self.downloads_dir, base_url, write_info_cache=False)
             
             # Generate appropriate feed
             if feed_name == 'master.xml':
@@ -315,7 +315,8 @@ def process_video_folder(video_folder: Path, preferred_language: str = "pl") ->
     print(f"📁 Processing: {video_folder.name}")
     
     # Find SRT file (prefer specified language, fallback to any available)
-    srt_files = list(video_folder.glob("*.srt"))
+    with os.scandir(video_folder) as entries:
+        srt_files = [Path(entry.path) for entry in entries if entry.name.endswith('.srt')]
     
     if not srt_files:
         print(f"   ⚠️  No SRT files found, skipping")
@@ -459,7 +460,9 @@ def process_channel(config: Dict) -> bool:
         return False
     
     # Find all video subfolders
-    video_folders = [d for d in channel_dir.iterdir() if d.is_dir() and not d.name.startswith('.')]
+    with os.scandir(channel_dir) as entries:
+        video_folders = [Path(entry.path) for entry in entries
+                         if not entry.name.startswith('.') and entry.is_dir()]
     
     if not video_folders:
         print(f"   ⚠️  No video folders found")
@@ -5,13 +5,29 @@ This script scans existing downloads and creates control files that can be used
 to skip already downloaded content in future runs.
 """
 
+import copy
+import functools
 import json
 import os
+import sys
 import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Set
 
+from rss_generator import load_json_file  # Uses orjson when it is installed
+
+# Downloads directory locations tried in order when --downloads-dir is not given
+DOWNLOADS_DIR_CANDIDATES = [
+    Path(path) for path in (
+        os.environ.get('PH_DOWNLOADS_DIR'),
+        "./downloads",
+        "/Volumes/MEDIA/data/podcasts/downloads",
+        "/Volumes/MEDIA/podcasts/downloads",
+    ) if path
+] + [Path.home() / "Downloads" / "podcasts" / "downloads"]
+
 
 def get_file_hash(filepath: Path) -> str:
     """Generate a hash for a file to detect changes."""
@@ -27,8 +43,7 @@ def get_file_hash(filepath: Path) -> str:
 def extract_video_info(info_json_path: Path) -> Dict:
     """Extract key information from yt-dlp info.json file."""
     try:
-        with open(info_json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json_file(info_json_path)
         
         return {
             'video_id': data.get('id', ''),
@@ -97,13 +112,20 @@ def find_matching_files(info_file: Path, channel_dir: Path) -> Dict:
             if thumb_file.exists():
                 files['thumbnails'].append(thumb_file.name)
     
-    # Look for subtitle files
+    # Look for subtitle files. Match names with a suffix test on one directory
+    # listing rather than glob, which treats [ ] in video titles as wildcards
+    with os.scandir(channel_dir) as entries:
+        srt_names = [entry.name for entry in entries if entry.name.endswith('.srt')]
+    
     for base in [base_name, alt_base_name]:
-        # Check for various subtitle patterns with language codes
-        for pattern in [f"{base}.*.srt", f"{base}.srt"]:
-            for sub_file in channel_dir.glob(pattern):
-                if sub_file.name not in files['subtitles']:
-                    files['subtitles'].append(sub_file.name)
+        # Check for various subtitle patterns with language codes (<base>.*.srt, then <base>.srt)
+        exact_name = f"{base}.srt"
+        candidates = [name for name in srt_names if name.startswith(f"{base}.") and name != exact_name]
+        if exact_name in srt_names:
+            candidates.append(exact_name)
+        for name in candidates:
+            if name not in files['subtitles']:
+                files['subtitles'].append(name)
         
         # Also check for specific language patterns
         for lang in ['en', 'pl', 'auto']:
@@ -144,14 +166,21 @@ def scan_channel_directory(channel_dir: Path) -> Dict:
     # Find all info.json files (these indicate downloaded videos)
     # Check both flat structure and subfolder structure
     info_files = []
+    subdirs = []
     
-    # Flat structure: files directly in channel directory
-    info_files.extend(list(channel_dir.glob('*.info.json')))
+    # Flat structure: files directly in channel directory. The same scandir pass
+    # collects subfolders, using the cached entry type instead of a stat per path
+    with os.scandir(channel_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.info.json'):
+                info_files.append(Path(entry.path))
+            elif not entry.name.startswith('.') and entry.is_dir():
+                subdirs.append(entry.path)
     
     # Subfolder structure: files in subdirectories
-    for subdir in channel_dir.iterdir():
-        if subdir.is_dir() and not subdir.name.startswith('.'):
-            info_files.extend(list(subdir.glob('*.info.json')))
+    for subdir in subdirs:
+        with os.scandir(subdir) as entries:
+            info_files.extend(Path(entry.path) for entry in entries if entry.name.endswith('.info.json'))
     
     for info_file in info_files:
         # Determine the working directory (either channel_dir or subdirectory)
@@ -296,6 +325,21 @@ def load_existing_control_file(channel_dir: Path) -> Dict:
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def load_channels_by_name(config_file: str) -> Dict[str, Dict]:
+    """Index a channels config file by channel name (read once per process)."""
+    by_name = {}
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            channels = json.load(f)
+        for channel in channels:
+            # Keep the first entry for a name, as a linear search would
+            by_name.setdefault(channel.get('channel_name'), channel)
+    except Exception:
+        pass
+    return by_name
+
+
 def should_preserve_deleted_records(channel_dir: Path, config_path: str = None) -> bool:
     """Check if we should preserve records of deleted files based on channel configuration."""
     # Look for channel configuration files to determine redownload_deleted setting
@@ -314,22 +358,20 @@ def should_preserve_deleted_records(channel_dir: Path, config_path: str = None)
     channel_name = channel_dir.name
     
     for config_file in config_files:
-        if config_file.exists():
-            try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    channels = json.load(f)
-                    
-                for channel in channels:
-                    if channel.get('channel_name') == channel_name:
-                        # Default to False (preserve deleted records) if not specified
-                        return not channel.get('redownload_deleted', False)
-            except Exception:
-                continue
+        channel = load_channels_by_name(str(config_file)).get(channel_name)
+        if channel is not None:
+            # Default to False (preserve deleted records) if not specified
+            return not channel.get('redownload_deleted', False)
     
     # Default to preserving deleted records (safer option)
     return True
 
 
+def without_timestamp(control_data: Dict) -> Dict:
+    """Return control data minus 'last_updated', for comparing file contents."""
+    return {key: value for key, value in control_data.items() if key != 'last_updated'}
+
+
 def create_control_file(channel_dir: Path, config_path: str = None) -> bool:
     """Create a control file for a channel directory, preserving deleted file records when appropriate."""
     if not channel_dir.exists() or not channel_dir.is_dir():
@@ -340,6 +382,9 @@ def create_control_file(channel_dir: Path, config_path: str = None) -> bool:
     
     # Load existing control file
     existing_control = load_existing_control_file(channel_dir)
+    # The merge below mutates the existing records in place; keep a pristine copy to
+    # tell whether anything actually changed
+    original_control = copy.deepcopy(without_timestamp(existing_control)) if existing_control else None
     preserve_deleted = should_preserve_deleted_records(channel_dir, config_path)
     
     # Scan the directory for current files
@@ -407,9 +452,13 @@ def create_control_file(channel_dir: Path, config_path: str = None) -> bool:
         if not preserve_deleted:
             print(f"  🔄 Rebuilding control file (redownload_deleted: true)")
     
-    # Write control file
+    # Write control file, unless only the timestamp would change
     control_file = channel_dir / '.download_control.json'
     try:
+        if original_control == without_timestamp(control_data):
+            print(f"  ✅ Control file for {channel_dir.name} already up to date")
+            return True
+        
         with open(control_file, 'w', encoding='utf-8') as f:
             json.dump(control_data, f, indent=2, ensure_ascii=False)
         
@@ -439,8 +488,13 @@ def main():
     parser = argparse.ArgumentParser(description="Create download control files for tracking downloaded content")
     parser.add_argument('--downloads-dir', help='Path to downloads directory')
     parser.add_argument('--config', help='Path to channels configuration file')
+    parser.add_argument('--workers', type=int, help='Channels processed in parallel (default: CPU count, 1 = sequential)')
     args = parser.parse_args()
     
+    if args.workers is not None and args.workers < 1:
+        print("Error: --workers must be at least 1")
+        sys.exit(1)
+    
     # If downloads directory specified, use it
     if args.downloads_dir:
         downloads_dir = Path(args.downloads_dir)
@@ -449,12 +503,7 @@ def main():
             return
     else:
         # Try multiple possible downloads directory locations
-        possible_dirs = [
-            Path("./downloads"),
-            Path("/Volumes/MEDIA/data/podcasts/downloads"),
-            Path("/Volumes/MEDIA/podcasts/downloads"),
-            Path.home() / "Downloads" / "podcasts" / "downloads"
-        ]
+        possible_dirs = DOWNLOADS_DIR_CANDIDATES
         
         downloads_dir = None
         for dir_path in possible_dirs:
@@ -471,21 +520,29 @@ def main():
     print("Creating download control files...")
     print("=" * 50)
     
-    # Find all channel directories
-    channel_dirs = [d for d in downloads_dir.iterdir() if d.is_dir()]
+    # Find all channel directories (hidden ones are never channels, so don't descend)
+    with os.scandir(downloads_dir) as entries:
+        channel_dirs = [Path(entry.path) for entry in entries
+                        if not entry.name.startswith('.') and entry.is_dir()]
     
     if not channel_dirs:
         print("No channel directories found")
         return
     
-    successful = 0
-    failed = 0
+    channel_dirs = sorted(channel_dirs)
+    
+    # Channels are independent and JSON encode/decode is CPU bound, so fan out
+    # across processes; output of different channels may interleave
+    if args.workers == 1 or len(channel_dirs) == 1:
+        results = [create_control_file(channel_dir, args.config) for channel_dir in channel_dirs]
+    else:
+        sys.stdout.flush()  # Don't let forked workers inherit and repeat buffered output
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(create_control_file, channel_dirs,
+                                        [args.config] * len(channel_dirs)))
     
-    for channel_dir in sorted(channel_dirs):
-        if create_control_file(channel_dir, args.config):
-            successful += 1
-        else:
-            failed += 1
+    successful = sum(1 for success in results if success)
+    failed = len(results) - successful
     
     print("\n" + "=" * 50)
     print("SUMMARY")
@@ -13,15 +13,40 @@ This script harvests content from YouTube channels with the following features:
 """
 
 import argparse
+import functools
 import json
 import os
 import sys
 import subprocess
+import tempfile
+import threading
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, KeysView, List, Optional, Set
+
+# Channels finishing in parallel all regenerate the same feeds directory; one at a time
+rss_update_lock = threading.Lock()
+
+# Shared HTTP session for notifications, created on first use (see get_notification_session)
+notification_session: Optional[requests.Session] = None
+notification_session_lock = threading.Lock()
+
+# ffmpeg workers shared by all channels, created on first use (see get_ffmpeg_pool)
+ffmpeg_pool: Optional[ThreadPoolExecutor] = None
+ffmpeg_pool_lock = threading.Lock()
+
+# Default number of index_history entries kept in .channel_index.json
+INDEX_HISTORY_LIMIT = 64
+
+# Image extensions yt-dlp uses for downloaded thumbnails
+THUMBNAIL_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
 
 
 def check_dependencies():
@@ -53,11 +78,28 @@ def load_send_config(send_config_path: Optional[str]) -> Optional[Dict]:
         return None
 
 
-def send_notification(send_config: Dict, message: str) -> bool:
+def get_notification_session() -> requests.Session:
+    """Return the shared notification session, so keep-alive connections are reused."""
+    global notification_session
+    with notification_session_lock:
+        if notification_session is None:
+            session = requests.Session()
+            # Retry transient connection failures in the adapter instead of failing the message
+            adapter = HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.3))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            notification_session = session
+        return notification_session
+
+
+def send_notification(send_config: Dict, message: str,
+                      session: Optional[requests.Session] = None) -> bool:
     """Send notification via configured endpoint."""
     if not send_config:
         return False
     
+    session = session or get_notification_session()
+    
     try:
         # Prepare request
         url = send_config['url']
@@ -74,7 +116,7 @@ def send_notification(send_config: Dict, message: str) -> bool:
                 body[key] = value
         
         # Send POST request
-        response = requests.post(url, headers=headers, json=body, timeout=timeout)
+        response = session.post(url, headers=headers, json=body, timeout=timeout)
         
         if response.status_code in [200, 201]:
             print(f"  📨 Notification sent successfully")
@@ -123,7 +165,8 @@ def sync_control_file_cutoff_date(channel_dir: Path, config_cutoff_date: str) ->
     return False
 
 
-def load_index_file(channel_dir: Path, cutoff_date: str) -> Optional[Dict]:
+def load_index_file(channel_dir: Path, cutoff_date: str,
+                    history_limit: int = INDEX_HISTORY_LIMIT) -> Optional[Dict]:
     """Load the unified channel index file if it exists."""
     index_file = channel_dir / '.channel_index.json'
     
@@ -143,11 +186,19 @@ def load_index_file(channel_dir: Path, cutoff_date: str) -> Optional[Dict]:
             index_data['cutoff_dates'] = []
         if 'index_history' not in index_data:
             index_data['index_history'] = []
+        elif len(index_data['index_history']) > history_limit:
+            # Older versions let the history grow without bound
+            index_data['index_history'] = index_data['index_history'][-history_limit:]
         if 'current_cutoff_date' not in index_data:
             index_data['current_cutoff_date'] = cutoff_date
         if 'last_updated' not in index_data:
             index_data['last_updated'] = index_data.get('created_date', datetime.now().isoformat())
         
+        # Drop description prefixes stored by older versions; they are rewritten away on next save
+        for video in index_data.get('videos', {}).values():
+            if 'description' in video:
+                video['has_description'] = bool(video.pop('description'))
+        
         print(f"  📋 Using existing unified channel index")
         return index_data
             
@@ -172,18 +223,18 @@ def save_index_file(channel_dir: Path, cutoff_date: str, index_data: Dict):
     index_data['current_cutoff_date'] = cutoff_date
     
     try:
-        with open(index_file, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, indent=2, ensure_ascii=False)
+        write_json_file(index_file, index_data)
         print(f"  💾 Saved unified channel index")
     except Exception as e:
         print(f"  ⚠️  Error saving index file: {e}")
 
 
-def update_unified_index(existing_index: Dict, new_videos: List[Dict], cutoff_date: str) -> Dict:
-    """Update an existing unified index with new videos and cutoff date."""
+def update_unified_index(existing_index: Dict, new_videos: List[Dict], cutoff_date: str,
+                         history_limit: int = INDEX_HISTORY_LIMIT) -> Dict:
+    """Update an existing unified index in place with new videos and cutoff date."""
     
     # Convert cutoff_date to YYYYMMDD format for comparison
-    cutoff_str = cutoff_date.replace('-', '')
+    cutoff_str = cutoff_date_key(cutoff_date)
     
     # Filter existing videos to only keep those that meet the new cutoff date
     existing_videos = existing_index.get('videos', {})
@@ -202,8 +253,8 @@ def update_unified_index(existing_index: Dict, new_videos: List[Dict], cutoff_da
             if len(str(video)) > len(str(filtered_videos[video_id])):
                 filtered_videos[video_id] = video
     
-    # Update index structure
-    updated_index = existing_index.copy()
+    # Update index structure (in place; a shallow copy wouldn't protect nested data anyway)
+    updated_index = existing_index
     updated_index['videos'] = filtered_videos
     updated_index['video_ids'] = list(filtered_videos.keys())
     updated_index['total_videos'] = len(filtered_videos)
@@ -227,6 +278,8 @@ def update_unified_index(existing_index: Dict, new_videos: List[Dict], cutoff_da
         'total_videos': len(new_videos),
         'source_file': 'updated_existing'
     })
+    # Keep only the most recent entries so the index doesn't grow with every run
+    updated_index['index_history'] = updated_index['index_history'][-history_limit:]
     
     # Recalculate date range
     video_dates = []
@@ -252,8 +305,7 @@ def create_channel_index(channel_url: str, channel_name: str, cutoff_date: str,
     
     # Parse cutoff date
     try:
-        cutoff_dt = datetime.strptime(cutoff_date, "%Y-%m-%d")
-        cutoff_str = cutoff_dt.strftime("%Y%m%d")
+        cutoff_str = cutoff_date_key(cutoff_date)
     except ValueError:
         print(f"Error: Invalid date format '{cutoff_date}'")
         return {}
@@ -320,11 +372,14 @@ def create_channel_index(channel_url: str, channel_name: str, cutoff_date: str,
             ]
             
             try:
-                detail_result = subprocess.run(cmd_detail, capture_output=True, text=True, timeout=10)
+                # Keep stdout as bytes: json.loads parses UTF-8 bytes directly, so decoding
+                # the (often several hundred KB) --dump-json output to str first is wasted work
+                detail_result = subprocess.run(cmd_detail, capture_output=True, timeout=10)
+                detail_output = detail_result.stdout.strip()
                 
-                if detail_result.stdout.strip():
+                if detail_output:
                     try:
-                        video_data = json.loads(detail_result.stdout.strip())
+                        video_data = json.loads(detail_output)
                         
                         # Extract relevant information
                         video_info = {
@@ -335,10 +390,13 @@ def create_channel_index(channel_url: str, channel_name: str, cutoff_date: str,
                             'webpage_url': video_data.get('webpage_url', ''),
                             'uploader': video_data.get('uploader', ''),
                             'view_count': video_data.get('view_count', 0),
-                            'description': video_data.get('description', '')[:200] + '...' if video_data.get('description') else ''
+                            # The description itself is kept in the video's .info.json,
+                            # storing it here only bloats every index load/save
+                            'has_description': bool(video_data.get('description'))
                         }
                         
                         # Only include if it has an upload date and meets cutoff
+                        # (YYYYMMDD strings compare correctly without parsing)
                         if video_info['upload_date'] and video_info['upload_date'] >= cutoff_str:
                             videos.append(video_info)
                             
@@ -413,10 +471,10 @@ def create_channel_index(channel_url: str, channel_name: str, cutoff_date: str,
         return {}
 
 
-def get_downloaded_video_ids(channel_dir: Path) -> Set[str]:
-    """Get set of already downloaded video IDs from control file."""
+def get_downloaded_video_ids(channel_dir: Path) -> KeysView[str]:
+    """Get already downloaded video IDs from control file as a set-like keys view."""
     control_data = load_control_file(channel_dir)
-    return set(control_data.get('downloaded_videos', {}).keys())
+    return control_data.get('downloaded_videos', {}).keys()
 
 
 def get_existing_video_ids(channel_dir: Path, redownload_deleted: bool = False) -> Set[str]:
@@ -472,6 +530,46 @@ def get_actually_existing_video_ids(channel_dir: Path) -> Set[str]:
     return existing_ids
 
 
+def get_mp3_video_ids(channel_dir: Path) -> Set[str]:
+    """Get set of video IDs whose mp3 is on disk, even if the control file is out of date.
+    
+    Folders already listed in the control file are resolved from it; only the others
+    need their .info.json read to learn the video ID.
+    """
+    control_data = load_control_file(channel_dir)
+    audio_files = {}
+    for video_id, video_info in control_data.get('downloaded_videos', {}).items():
+        audio_file = video_info.get('files', {}).get('audio')
+        if audio_file:
+            audio_files[audio_file] = video_id
+    
+    with os.scandir(channel_dir) as entries:
+        video_dirs = [entry for entry in entries if not entry.name.startswith('.') and entry.is_dir()]
+    
+    mp3_ids = set()
+    for video_dir in video_dirs:
+        with os.scandir(video_dir.path) as entries:
+            names = [entry.name for entry in entries]
+        
+        mp3_name = next((name for name in names if name.endswith('.mp3')), None)
+        if not mp3_name:
+            continue
+        
+        video_id = audio_files.get(f"{video_dir.name}/{mp3_name}")
+        info_name = next((name for name in names if name.endswith('.info.json')), None)
+        if not video_id and info_name:
+            try:
+                with open(os.path.join(video_dir.path, info_name), 'r', encoding='utf-8') as f:
+                    video_id = json.load(f).get('id')
+            except (OSError, ValueError):
+                continue
+        
+        if video_id:
+            mp3_ids.add(video_id)
+    
+    return mp3_ids
+
+
 def load_channels_config(config_file: str) -> List[Dict]:
     """Load channels configuration from JSON file."""
     try:
@@ -493,6 +591,22 @@ def load_channels_config(config_file: str) -> List[Dict]:
         return []
 
 
+def write_json_file(path, data, indent: int = 2):
+    """Write JSON to a temporary file and rename it over `path`.
+    
+    The rename is atomic, so an interrupted run never leaves a truncated file behind.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def update_cutoff_dates_to_today(config_file: str) -> bool:
     """Update all cutoff dates in config file to today's date."""
     try:
@@ -515,8 +629,7 @@ def update_cutoff_dates_to_today(config_file: str) -> bool:
         
         # Save updated config if changes were made
         if updated_count > 0:
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
+            write_json_file(config_file, config, indent=4)
             
             print(f"📅 Updated cutoff dates to {today} for {updated_count} channels")
             return True
@@ -528,50 +641,74 @@ def update_cutoff_dates_to_today(config_file: str) -> bool:
         return False
 
 
-def validate_channel_config(config: Dict) -> bool:
-    """Validate a single channel configuration."""
-    required_fields = ['url', 'channel_name', 'content_type', 'cutoff_date']
-    
-    for field in required_fields:
-        if field not in config:
-            print(f"Error: Missing required field '{field}' in channel configuration")
-            return False
+# Declarative rules for a channel entry, applied by channel_config_errors()
+REQUIRED_CHANNEL_FIELDS = ('url', 'channel_name', 'content_type', 'cutoff_date')
+BOOLEAN_CHANNEL_FIELDS = ('download_metadata', 'download_transcript', 'redownload_deleted')
+CHANNEL_FIELD_CHOICES = {
+    'content_type': ('audio', 'video'),
+    'summarize': ('yes', 'no'),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def parse_cutoff_date(cutoff_date: str) -> datetime:
+    """Parse a YYYY-MM-DD cutoff date, caching the result since channels share few dates."""
+    return datetime.strptime(cutoff_date, "%Y-%m-%d")
+
+
+@functools.lru_cache(maxsize=None)
+def cutoff_date_key(cutoff_date: str) -> str:
+    """Return a cutoff date as YYYYMMDD, directly comparable with yt-dlp upload_date values."""
+    return parse_cutoff_date(cutoff_date).strftime("%Y%m%d")
+
+
+def channel_config_errors(config: Dict) -> List[str]:
+    """Return every problem found in a single channel configuration."""
+    errors = [f"Missing required field '{field}' in channel configuration"
+              for field in REQUIRED_CHANNEL_FIELDS if field not in config]
     
-    # Validate content type
-    if config['content_type'] not in ['audio', 'video']:
-        print(f"Error: Invalid content_type '{config['content_type']}'. Must be 'audio' or 'video'")
-        return False
+    # Validate enumerated fields (content_type, summarize)
+    for field, choices in CHANNEL_FIELD_CHOICES.items():
+        if field in config and config[field] not in choices:
+            errors.append(f"Invalid {field} '{config[field]}'. Must be "
+                          + ' or '.join(f"'{choice}'" for choice in choices))
     
     # Validate date format
-    try:
-        datetime.strptime(config['cutoff_date'], "%Y-%m-%d")
-    except ValueError:
-        print(f"Error: Invalid date format '{config['cutoff_date']}'. Use YYYY-MM-DD")
-        return False
+    if 'cutoff_date' in config:
+        try:
+            parse_cutoff_date(config['cutoff_date'])
+        except (TypeError, ValueError):
+            errors.append(f"Invalid date format '{config['cutoff_date']}'. Use YYYY-MM-DD")
     
     # Validate optional boolean fields
-    for field in ['download_metadata', 'download_transcript', 'redownload_deleted']:
-        if field in config and not isinstance(config[field], bool):
-            print(f"Error: '{field}' must be true or false")
-            return False
+    errors.extend(f"'{field}' must be true or false"
+                  for field in BOOLEAN_CHANNEL_FIELDS
+                  if field in config and not isinstance(config[field], bool))
     
-    # Validate summarize field
-    if 'summarize' in config:
-        if config['summarize'] not in ['yes', 'no']:
-            print(f"Error: 'summarize' must be 'yes' or 'no'")
-            return False
+    # Validate index history limit
+    if 'index_history_limit' in config:
+        limit = config['index_history_limit']
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            errors.append("'index_history_limit' must be a positive integer")
     
     # Validate transcript languages if specified
     if 'transcript_languages' in config:
-        if not isinstance(config['transcript_languages'], list):
-            print(f"Error: 'transcript_languages' must be a list of language codes")
-            return False
-        for lang in config['transcript_languages']:
-            if not isinstance(lang, str) or len(lang) < 2:
-                print(f"Error: Invalid language code '{lang}' in transcript_languages")
-                return False
+        languages = config['transcript_languages']
+        if not isinstance(languages, list):
+            errors.append("'transcript_languages' must be a list of language codes")
+        else:
+            errors.extend(f"Invalid language code '{lang}' in transcript_languages"
+                          for lang in languages if not isinstance(lang, str) or len(lang) < 2)
     
-    return True
+    return errors
+
+
+def validate_channel_config(config: Dict) -> bool:
+    """Validate a single channel configuration, reporting all errors at once."""
+    errors = channel_config_errors(config)
+    for error in errors:
+        print(f"Error: {error}")
+    return not errors
 
 
 def download_channel_with_index(config: Dict, download_format: Optional[str] = None, 
@@ -586,10 +723,11 @@ def download_channel_with_index(config: Dict, download_format: Optional[str] = N
     cutoff_date_str = config['cutoff_date']
     dest_dir = config.get('output_directory', f"downloads/{channel_name}")
     output_format = config.get('output_format', '%(upload_date)s_%(channel_name)s_%(title)s')
+    history_limit = config.get('index_history_limit', INDEX_HISTORY_LIMIT)
     
     # Parse cutoff date
     try:
-        cutoff_date = datetime.strptime(cutoff_date_str, "%Y-%m-%d")
+        cutoff_date_key(cutoff_date_str)
     except ValueError:
         print(f"Error: Invalid date format '{cutoff_date_str}' for channel {channel_name}")
         return False
@@ -609,7 +747,7 @@ def download_channel_with_index(config: Dict, download_format: Optional[str] = N
     # Step 1: Load or create channel index
     index_data = None
     if not force_reindex:
-        index_data = load_index_file(dest_path, cutoff_date_str)
+        index_data = load_index_file(dest_path, cutoff_date_str, history_limit)
     
     if not index_data:
         print(f"  📋 Creating channel index...")
@@ -633,7 +771,7 @@ def download_channel_with_index(config: Dict, download_format: Optional[str] = N
             if new_index and new_index.get('videos'):
                 # Merge with existing index
                 new_videos = list(new_index['videos'].values())
-                index_data = update_unified_index(index_data, new_videos, cutoff_date_str)
+                index_data = update_unified_index(index_data, new_videos, cutoff_date_str, history_limit)
                 save_index_file(dest_path, cutoff_date_str, index_data)
                 print(f"  ✅ Updated index: {index_data['total_videos']} total videos")
             else:
@@ -681,9 +819,15 @@ def download_channel_with_index(config: Dict, download_format: Optional[str] = N
                 print(f"     📥 Will re-download {deleted_count} previously downloaded but deleted videos")
     
     # Step 3: Determine what needs to be downloaded
-    indexed_video_ids = set(index_data.get('video_ids', []))
+    # dict_keys supports set operations directly, so no intermediate set is built
+    indexed_video_ids = (index_data.get('videos') or {}).keys()
     videos_to_download = indexed_video_ids - downloaded_ids if skip_existing else indexed_video_ids
     
+    # mp3 conversion happens outside yt-dlp, so it can't see that a video's mp3 already
+    # exists and would fetch the whole audio stream again; leave those videos out
+    if content_type == "audio" and videos_to_download:
+        videos_to_download = videos_to_download - get_mp3_video_ids(dest_path)
+    
     if not videos_to_download:
         print(f"  ✅ All indexed videos already downloaded for {channel_name}")
         return True
@@ -780,16 +924,16 @@ def download_videos_from_list(video_urls: List[str], dest_dir: str, output_forma
     
     # Add audio-specific options
     if content_type == "audio":
+        # mp3 conversion is done by our own ffmpeg pool (see run_audio_pipeline)
+        # so the next download overlaps with transcoding of the previous one
         cmd.extend([
-            '--extract-audio',           # Extract audio from video
-            '--audio-format', 'mp3',     # Convert to mp3 if not already
-            '--audio-quality', '0',      # Best audio quality
             '--embed-metadata',          # Embed metadata in audio file
             '--add-metadata',            # Add metadata to file
         ])
     
-    # Add video URLs
-    cmd.extend(video_urls)
+    # Read video URLs from stdin so large batches can't exceed the argv size limit
+    cmd.extend(['--batch-file', '-'])
+    batch_input = '\n'.join(video_urls) + '\n'
     
     print(f"  🚀 Starting download of {len(video_urls)} videos...")
     print(f"     Content type: {content_type}")
@@ -800,7 +944,10 @@ def download_videos_from_list(video_urls: List[str], dest_dir: str, output_forma
     try:
         # Execute yt-dlp command
         start_time = time.time()
-        result = subprocess.run(cmd, check=True)
+        if content_type == "audio":
+            run_audio_pipeline(cmd, batch_input)
+        else:
+            subprocess.run(cmd, check=True, input=batch_input, text=True)
         end_time = time.time()
         
         duration = end_time - start_time
@@ -825,7 +972,8 @@ def download_videos_from_list(video_urls: List[str], dest_dir: str, output_forma
                 from rss_generator import update_rss_feeds
                 downloads_path = Path(dest_dir).parent  # Get parent downloads directory
                 feeds_path = downloads_path / 'feeds'
-                update_rss_feeds(downloads_path, feeds_path)
+                with rss_update_lock:
+                    update_rss_feeds(downloads_path, feeds_path)
                 print(f"  📡 RSS feeds updated")
             except Exception as e:
                 print(f"  ⚠️  Warning: Could not update RSS feeds: {e}")
@@ -840,6 +988,103 @@ def download_videos_from_list(video_urls: List[str], dest_dir: str, output_forma
         return False
 
 
+def transcode_to_mp3(src_path: str) -> Optional[str]:
+    """Convert a downloaded audio stream to mp3 and remove the original."""
+    src = Path(src_path)
+    if src.suffix.lower() == '.mp3':
+        return str(src)
+    
+    dst = src.with_suffix('.mp3')
+    if dst.exists():
+        # Respect --no-overwrites semantics: never re-encode an existing mp3, but don't
+        # leave the redundant download next to it (it would show up as a video file)
+        src.unlink()
+        return str(dst)
+    
+    cmd = [
+        'ffmpeg',
+        '-nostdin',
+        '-loglevel', 'error',
+        '-i', str(src),
+        '-vn',                       # Drop any video stream
+        '-map_metadata', '0',        # Keep the metadata embedded by yt-dlp
+        '-codec:a', 'libmp3lame',
+        '-q:a', '0',                 # Best VBR quality (same as --audio-quality 0)
+        str(dst)
+    ]
+    
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"     ⚠️  Could not convert {src.name} to mp3: {e}")
+        if dst.exists():
+            dst.unlink()
+        return None
+    
+    src.unlink()
+    return str(dst)
+
+
+def get_ffmpeg_pool() -> ThreadPoolExecutor:
+    """Return the process-wide ffmpeg worker pool, creating it on first use.
+    
+    Channels downloading in parallel share it, so concurrent encodes stay at
+    one less than the CPU count however many channels are running.
+    """
+    global ffmpeg_pool
+    with ffmpeg_pool_lock:
+        if ffmpeg_pool is None:
+            # Leave one core for yt-dlp itself
+            workers = max(1, (os.cpu_count() or 2) - 1)
+            ffmpeg_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ffmpeg')
+        return ffmpeg_pool
+
+
+def run_audio_pipeline(cmd: List[str], batch_input: str):
+    """Run yt-dlp and transcode each finished download while the next one is fetched.
+    
+    yt-dlp appends the path of every completed file to a temporary file, which is
+    polled while it runs; each path is handed to an ffmpeg worker pool so network
+    and CPU work overlap instead of alternating. yt-dlp's own output (progress bar
+    included) stays on the terminal: unlike --print, --print-to-file doesn't imply --quiet.
+    """
+    pool = get_ffmpeg_pool()
+    conversions = []
+    
+    with tempfile.TemporaryDirectory(prefix='podcastharvester-') as tmp_dir:
+        paths_file = os.path.join(tmp_dir, 'finished.txt')
+        open(paths_file, 'w').close()
+        
+        process = subprocess.Popen(cmd + ['--print-to-file', 'after_move:filepath', paths_file],
+                                   stdin=subprocess.PIPE, text=True)
+        # yt-dlp reads the whole batch file before it starts downloading
+        process.stdin.write(batch_input)
+        process.stdin.close()
+        
+        with open(paths_file, 'r', encoding='utf-8') as finished:
+            pending = ''
+            while True:
+                exited = process.poll() is not None
+                # Only complete lines are paths; a partial one is kept for the next poll
+                pending += finished.read()
+                *lines, pending = pending.split('\n')
+                for file_path in lines:
+                    if file_path.strip():
+                        conversions.append(pool.submit(transcode_to_mp3, file_path.strip()))
+                if exited:
+                    break
+                time.sleep(0.5)
+        returncode = process.returncode
+    
+    # Wait for this channel's conversions only (result() blocks until each is done)
+    failed = sum(1 for conversion in conversions if conversion.result() is None)
+    if failed:
+        print(f"  ⚠️  {failed} of {len(conversions)} files could not be converted to mp3")
+    
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
 def cleanup_thumbnails(dest_dir: str, output_format: str):
     """Remove lower resolution thumbnails, keeping only the highest resolution one."""
     
@@ -849,51 +1094,42 @@ def cleanup_thumbnails(dest_dir: str, output_format: str):
     if not dest_path.exists():
         return
     
-    # Find all subdirectories (video folders)
-    video_dirs = [d for d in dest_path.iterdir() if d.is_dir()]
-    
     thumbnails_processed = 0
     thumbnails_removed = 0
     
+    # Walk video folders with scandir so each entry is stat'ed at most once
+    with os.scandir(dest_path) as channel_entries:
+        video_dirs = [entry.path for entry in channel_entries if entry.is_dir()]
+    
     for video_dir in video_dirs:
-        # Find all thumbnail files in this video directory
-        thumbnail_files = []
-        
-        # Look for common thumbnail extensions
-        for ext in ['*.jpg', '*.jpeg', '*.png', '*.webp']:
-            thumbnail_files.extend(video_dir.glob(ext))
-        
-        if len(thumbnail_files) <= 1:
-            continue  # No cleanup needed if 1 or fewer thumbnails
-        
         # Group thumbnails by base name (same video, different resolutions)
-        thumbnail_groups = {}
-        for thumb_file in thumbnail_files:
-            # Extract base name (everything before the resolution identifier)
-            name_parts = thumb_file.stem.split('.')
-            if len(name_parts) >= 2:
-                # Assume format: basename.resolution.ext
-                base_name = '.'.join(name_parts[:-1])
-                if base_name not in thumbnail_groups:
-                    thumbnail_groups[base_name] = []
-                thumbnail_groups[base_name].append(thumb_file)
+        # Assume format: basename.resolution.ext
+        thumbnail_groups = defaultdict(list)
+        with os.scandir(video_dir) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(THUMBNAIL_EXTENSIONS):
+                    continue
+                name_parts = entry.name.rsplit('.', 2)
+                if len(name_parts) == 3 and entry.is_file(follow_symlinks=False):
+                    size = entry.stat(follow_symlinks=False).st_size
+                    thumbnail_groups[name_parts[0]].append((size, entry))
         
         # For each group, keep only the largest file (highest resolution)
-        for base_name, thumb_list in thumbnail_groups.items():
+        for thumb_list in thumbnail_groups.values():
             if len(thumb_list) <= 1:
                 continue
             
-            # Find the largest thumbnail (highest resolution)
-            largest_thumb = max(thumb_list, key=lambda f: f.stat().st_size)
+            largest_thumb = max(thumb_list, key=itemgetter(0))
             
             # Remove all other thumbnails
-            for thumb_file in thumb_list:
-                if thumb_file != largest_thumb:
+            for thumb in thumb_list:
+                if thumb is not largest_thumb:
+                    thumb_entry = thumb[1]
                     try:
-                        thumb_file.unlink()
+                        os.unlink(thumb_entry.path)
                         thumbnails_removed += 1
                     except Exception as e:
-                        print(f"     Warning: Could not remove {thumb_file.name}: {e}")
+                        print(f"     Warning: Could not remove {thumb_entry.name}: {e}")
             
             thumbnails_processed += 1
     
@@ -903,11 +1139,171 @@ def cleanup_thumbnails(dest_dir: str, output_format: str):
         print(f"     Kept highest resolution thumbnails only")
 
 
+class TokenBucket:
+    """Thread-safe token bucket that limits how often channel downloads may start.
+    
+    Up to `capacity` channels may start back to back; after that, starts are spaced
+    to `rate_per_minute` on average. Waiting only happens when the rate is exceeded.
+    """
+    
+    def __init__(self, rate_per_minute: float, capacity: int = 1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """Take one token, sleeping until it becomes available.
+        
+        Returns False without waiting out the delay if `stop` is set meanwhile.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now so concurrent callers queue up behind each other
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if wait > 0:
+            print(f"⏳ Rate limit: waiting {wait:.1f} seconds before next channel...")
+            if stop is not None:
+                return not stop.wait(wait)
+            time.sleep(wait)
+        return stop is None or not stop.is_set()
+
+
+class ChannelTaggedOutput:
+    """sys.stdout replacement that prefixes lines printed by batch worker threads.
+    
+    Each worker thread registers the channel it is processing; its output is buffered
+    per thread and written a whole line at a time as "[channel] line", so lines from
+    parallel channels never mix. Output of child processes (yt-dlp, ffmpeg) goes to
+    the terminal directly and is not tagged.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+    
+    def set_channel(self, channel_name: Optional[str]):
+        """Tag this thread's output with `channel_name` (None: write untagged)."""
+        self.flush_pending()
+        self.local.channel = channel_name
+        self.local.pending = ''
+    
+    def write(self, text: str) -> int:
+        channel = getattr(self.local, 'channel', None)
+        if channel is None:
+            with self.lock:
+                return self.stream.write(text)
+        
+        *lines, self.local.pending = (self.local.pending + text).split('\n')
+        if lines:
+            with self.lock:
+                self.stream.write(''.join(f"[{channel}] {line}\n" for line in lines))
+        return len(text)
+    
+    def flush_pending(self):
+        """Write out this thread's unterminated last line, if any."""
+        pending = getattr(self.local, 'pending', '')
+        if pending:
+            self.local.pending = ''
+            self.write(pending + '\n')
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def run_batch(configs: List[Dict], download_format: Optional[str] = None,
+              skip_existing: bool = True, force_reindex: bool = False,
+              send_config: Optional[Dict] = None, workers: Optional[int] = None,
+              rate_limiter: Optional[TokenBucket] = None) -> Dict[str, bool]:
+    """Download several validated channels, running up to `workers` of them concurrently.
+    
+    Channel downloads are dominated by network I/O, so threads overlap well. The
+    worker count defaults to the PH_CHANNEL_WORKERS environment variable (4 if unset);
+    a value of 1 keeps the original sequential behaviour. Channel starts are paced by
+    `rate_limiter` (default: 20 per minute, no bursts, i.e. one every 3 seconds).
+    """
+    if workers is None:
+        workers = int(os.environ.get('PH_CHANNEL_WORKERS', '4'))
+    workers = max(1, workers)
+    if rate_limiter is None:
+        rate_limiter = TokenBucket(20)
+    
+    results = {}
+    if not configs:
+        return results
+    
+    # Set on Ctrl-C so workers waiting for a token give up instead of starting a channel
+    stop = threading.Event()
+    
+    def paced_download(config: Dict) -> bool:
+        # Be respectful to YouTube: wait for a token before starting each channel
+        if not rate_limiter.acquire(stop):
+            return False
+        return download_channel_with_index(config, download_format, skip_existing,
+                                           force_reindex, send_config)
+    
+    if workers == 1:
+        for i, config in enumerate(configs, 1):
+            print(f"\n[{i}/{len(configs)}] Processing channel: {config['channel_name']}")
+            results[config['channel_name']] = paced_download(config)
+        return results
+    
+    print(f"⚡ Processing up to {workers} channels in parallel (lines are tagged with their channel)")
+    
+    tagged_output = ChannelTaggedOutput(sys.stdout)
+    
+    def tagged_download(config: Dict) -> bool:
+        tagged_output.set_channel(config['channel_name'])
+        try:
+            return paced_download(config)
+        finally:
+            tagged_output.set_channel(None)
+    
+    sys.stdout = tagged_output
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(configs)))
+    try:
+        futures = {executor.submit(tagged_download, config): config['channel_name'] for config in configs}
+        
+        for done, future in enumerate(as_completed(futures), 1):
+            channel_name = futures[future]
+            try:
+                success = future.result()
+            except Exception as e:
+                print(f"  ❌ Unexpected error processing {channel_name}: {e}")
+                success = False
+            
+            results[channel_name] = success
+            print(f"\n[{done}/{len(configs)}] {'✅' if success else '❌'} Finished channel: {channel_name}")
+    except KeyboardInterrupt:
+        # Don't start queued channels; the running yt-dlp children got the SIGINT too
+        print(f"\n⚠️  Batch interrupted by user, cancelling remaining channels")
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        sys.stdout = tagged_output.stream
+    executor.shutdown()
+    
+    # Report results in configuration order rather than completion order
+    return {config['channel_name']: results[config['channel_name']] for config in configs}
+
+
 def process_channels_batch(config_file: str, download_format: Optional[str] = None, 
                           max_channels: Optional[int] = None, 
                           skip_existing: bool = True, force_reindex: bool = False,
                           selected_channels: Optional[List[str]] = None,
-                          send_config: Optional[Dict] = None) -> Dict[str, bool]:
+                          send_config: Optional[Dict] = None,
+                          max_workers: Optional[int] = None,
+                          rate_limiter: Optional[TokenBucket] = None) -> Dict[str, bool]:
     """Process multiple channels from configuration file with indexing."""
     
     # Load configuration
@@ -918,23 +1314,22 @@ def process_channels_batch(config_file: str, download_format: Optional[str] = No
     # Filter by selected channels if specified
     if selected_channels:
         # Convert selected channels to lowercase for case-insensitive matching
-        selected_lower = [name.lower() for name in selected_channels]
+        selected_lower = {name.lower() for name in selected_channels}
         
         # Filter channels by name
         filtered_config = []
         found_channels = []
+        found_lower = set()
         
         for config in channels_config:
-            channel_name = config.get('channel_name', '').lower()
-            if channel_name in selected_lower:
+            channel_name = config.get('channel_name', '')
+            if channel_name.lower() in selected_lower:
                 filtered_config.append(config)
-                found_channels.append(config.get('channel_name', ''))
+                found_channels.append(channel_name)
+                found_lower.add(channel_name.lower())
         
         # Report which channels were found/not found
-        not_found = []
-        for selected in selected_channels:
-            if not any(selected.lower() == found.lower() for found in found_channels):
-                not_found.append(selected)
+        not_found = [selected for selected in selected_channels if selected.lower() not in found_lower]
         
         if not_found:
             print(f"⚠️  Channels not found in configuration: {', '.join(not_found)}")
@@ -958,33 +1353,22 @@ def process_channels_batch(config_file: str, download_format: Optional[str] = No
     print("=" * 60)
     
     results = {}
-    successful = 0
-    failed = 0
-    total_indexed = 0
-    total_downloaded = 0
+    valid_configs = []
     
+    # Validate configurations up front so errors surface before any download starts
     for i, config in enumerate(channels_config, 1):
-        print(f"\n[{i}/{len(channels_config)}] Processing channel: {config.get('channel_name', 'Unknown')}")
-        
-        # Validate configuration
         if not validate_channel_config(config):
+            print(f"❌ Skipping invalid configuration: {config.get('channel_name', f'Channel_{i}')}")
             results[config.get('channel_name', f'Channel_{i}')] = False
-            failed += 1
-            continue
-        
-        # Process channel with indexing
-        success = download_channel_with_index(config, download_format, skip_existing, force_reindex, send_config)
-        results[config['channel_name']] = success
-        
-        if success:
-            successful += 1
         else:
-            failed += 1
-        
-        # Add a small delay between downloads to be respectful
-        if i < len(channels_config):
-            print("⏳ Waiting 3 seconds before next channel...")
-            time.sleep(3)
+            valid_configs.append(config)
+    
+    # Process channels with indexing
+    results.update(run_batch(valid_configs, download_format, skip_existing, force_reindex,
+                             send_config, max_workers, rate_limiter))
+    
+    successful = sum(1 for success in results.values() if success)
+    failed = len(results) - successful
     
     # Print summary
     print("\n" + "=" * 60)
@@ -1033,6 +1417,9 @@ Examples:
   Process only first 3 channels:
     python youtube_channel_downloader_indexed.py --config test_channels.json --max-channels 3
 
+  Process 8 channels in parallel:
+    python youtube_channel_downloader_indexed.py --config channels_config.json --max-workers 8
+
   Combine channel selection with other options:
     python youtube_channel_downloader_indexed.py --config channels_config_full.json --channels "Asianometry,CopernicusCenter" --force-reindex
         """
@@ -1045,6 +1432,12 @@ Examples:
     parser.add_argument('--force-reindex', action='store_true', help='Force recreation of channel indexes')
     parser.add_argument('--channels', help='Comma-separated list of specific channel names to process (e.g., "ColdFusion,PBoyle,Finansowaedukacja")')
     parser.add_argument('--send-config', help='Path to notification configuration file (send_config.json)')
+    parser.add_argument('--max-workers', type=int,
+                        help='Number of channels to process in parallel (default: $PH_CHANNEL_WORKERS or 4, 1 = sequential)')
+    parser.add_argument('--rate-per-minute', type=float, default=20,
+                        help='Maximum number of channels started per minute (default: 20)')
+    parser.add_argument('--burst', type=int, default=1,
+                        help='Number of channels that may start back to back before rate limiting applies (default: 1)')
     
     # Common arguments
     parser.add_argument('--format', help='Download format (e.g., bestaudio/best, best)')
@@ -1055,6 +1448,25 @@ Examples:
     if not check_dependencies():
         sys.exit(1)
     
+    if args.rate_per_minute <= 0 or args.burst < 1:
+        print("Error: --rate-per-minute must be positive and --burst at least 1")
+        sys.exit(1)
+    
+    if args.max_workers is not None and args.max_workers < 1:
+        print("Error: --max-workers must be at least 1")
+        sys.exit(1)
+    
+    # Resolve the parallel channel count now, so a bad value fails before any work starts
+    if args.max_workers is None:
+        env_workers = os.environ.get('PH_CHANNEL_WORKERS', '4')
+        try:
+            args.max_workers = int(env_workers)
+        except ValueError:
+            args.max_workers = 0
+        if args.max_workers < 1:
+            print(f"Error: PH_CHANNEL_WORKERS must be a whole number of at least 1 (got '{env_workers}')")
+            sys.exit(1)
+    
     # Determine skip setting
     skip_existing = not args.no_skip
     
@@ -1086,7 +1498,9 @@ Examples:
         skip_existing, 
         args.force_reindex,
         selected_channels,
-        send_config
+        send_config,
+        args.max_workers,
+        TokenBucket(args.rate_per_minute, args.burst)
     )
     
     # Automatically update control files (run regardless of failures)
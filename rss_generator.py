@@ -6,22 +6,70 @@ Generates RSS feeds for downloaded content to notify external programs
 like FreshRSS or Audiobookshelf about new content availability.
 """
 
+import heapq
 import json
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from email.utils import format_datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from xml.etree.ElementTree import Element, SubElement, tostring
 import xml.etree.ElementTree as ET
 
+try:
+    import orjson  # Optional: parses large .info.json files several times faster
+except ImportError:
+    orjson = None
+
+# Sidecar file caching the few info.json fields used for feed items
+INFO_CACHE_FILE = '.rss_info_cache.json'
+INFO_CACHE_FIELDS = ('title', 'description', 'upload_date', 'duration', 'webpage_url')
+
+# Per-folder item cache kept in the feeds directory between update_rss_feeds runs
+ITEMS_CACHE_FILE = '.rss_items_cache.json'
+
+# Media extensions in order of preference (audio first), plus a set for membership tests
+MEDIA_EXTENSIONS = ('.mp3', '.m4a', '.aac', '.mp4', '.webm', '.mkv')
+MEDIA_EXTENSION_SET = frozenset(MEDIA_EXTENSIONS)
+
+MIME_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.m4a': 'audio/mp4',
+    '.aac': 'audio/aac',
+    '.mp4': 'video/mp4',
+    '.webm': 'video/webm',
+    '.mkv': 'video/x-matroska'
+}
+
+
+def load_json_file(path) -> Any:
+    """Parse a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 
 class RSSGenerator:
-    def __init__(self, downloads_dir: Path, base_url: str = "http://localhost:8080"):
+    def __init__(self, downloads_dir: Path, base_url: str = "http://localhost:8080",
+                 write_info_cache: bool = True):
         self.downloads_dir = downloads_dir
         self.base_url = base_url.rstrip('/')
+        # Whether to create/refresh the per-video INFO_CACHE_FILE sidecars (reading them is always allowed)
+        self.write_info_cache = write_info_cache
+        # Extracted items per channel directory, shared by the master and channel feeds
+        self._items_cache: Dict[Path, List[Dict]] = {}
         
     def generate_channel_feed(self, channel_name: str, max_items: int = 50) -> str:
         """Generate RSS feed for a specific channel."""
+        return self._format_xml(self.build_channel_feed(channel_name, max_items))
+    
+    def build_channel_feed(self, channel_name: str, max_items: int = 50) -> Element:
+        """Build the RSS element tree for a specific channel."""
         channel_dir = self.downloads_dir / channel_name
         if not channel_dir.exists():
             return self._empty_feed(channel_name)
@@ -37,17 +85,21 @@ class RSSGenerator:
         SubElement(channel, 'title').text = f"PodcastHarvester - {channel_name}"
         SubElement(channel, 'description').text = f"Downloaded content from {channel_name}"
         SubElement(channel, 'link').text = f"{self.base_url}/channel/{channel_name}"
-        SubElement(channel, 'lastBuildDate').text = datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S %z')
+        SubElement(channel, 'lastBuildDate').text = format_datetime(datetime.now(timezone.utc), usegmt=True)
         SubElement(channel, 'generator').text = "PodcastHarvester RSS Generator"
         
         # Add items
         for item_data in items:
             self._add_item_to_channel(channel, item_data)
         
-        return self._format_xml(rss)
+        return rss
     
     def generate_master_feed(self, max_items: int = 100) -> str:
         """Generate master RSS feed with content from all channels."""
+        return self._format_xml(self.build_master_feed(max_items))
+    
+    def build_master_feed(self, max_items: int = 100) -> Element:
+        """Build the RSS element tree with content from all channels."""
         all_items = []
         
         # Collect items from all channels
@@ -57,8 +109,7 @@ class RSSGenerator:
                 all_items.extend(items)
         
         # Sort by date (newest first)
-        all_items.sort(key=lambda x: x.get('pub_date', ''), reverse=True)
-        all_items = all_items[:max_items]
+        all_items = heapq.nlargest(max_items, all_items, key=lambda x: x.get('pub_date', ''))
         
         # Create RSS structure
         rss = Element('rss', version='2.0')
@@ -66,76 +117,138 @@ class RSSGenerator:
         SubElement(channel, 'title').text = "PodcastHarvester - All Channels"
         SubElement(channel, 'description').text = "All downloaded content from PodcastHarvester"
         SubElement(channel, 'link').text = f"{self.base_url}/feeds/master"
-        SubElement(channel, 'lastBuildDate').text = datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S %z')
+        SubElement(channel, 'lastBuildDate').text = format_datetime(datetime.now(timezone.utc), usegmt=True)
         
         # Add items
         for item_data in all_items:
             self._add_item_to_channel(channel, item_data)
         
-        return self._format_xml(rss)
+        return rss
+    
+    def seed_items(self, channel_dir: Path, scanned: Dict[str, list]):
+        """Use the result of _scan_channel_entries for channel_dir instead of scanning it again."""
+        self._items_cache[channel_dir] = [item for _, item in scanned.values() if item]
     
     def _get_channel_items(self, channel_dir: Path, max_items: int) -> List[Dict]:
-        """Extract items from a channel directory."""
-        items = []
+        """Extract items from a channel directory, scanning it at most once per generator."""
+        items = self._items_cache.get(channel_dir)
+        if items is None:
+            items = self._items_cache[channel_dir] = self._scan_channel_items(channel_dir)
+        
+        # Newest first by upload date; only the top max_items are needed, not a full sort
+        return heapq.nlargest(max_items, items, key=lambda x: x.get('upload_date', ''))
+    
+    def _scan_channel_items(self, channel_dir: Path) -> List[Dict]:
+        """Extract all items from a channel directory."""
+        return [item for _, item in self._scan_channel_entries(channel_dir).values() if item]
+    
+    def _scan_channel_entries(self, channel_dir: Path, previous: Optional[Dict[str, list]] = None) -> Dict[str, list]:
+        """Map each video folder name to [folder mtime_ns, item or None].
+        
+        Folders whose mtime matches the `previous` scan reuse that result without being
+        opened; adding or removing files in a folder changes its mtime.
+        """
+        previous = previous or {}
+        scanned = {}
+        
+        with os.scandir(channel_dir) as entries:
+            video_dirs = [entry for entry in entries
+                          if not entry.name.startswith('.') and entry.is_dir()]
         
-        for video_dir in channel_dir.iterdir():
-            if not video_dir.is_dir() or video_dir.name.startswith('.'):
+        for entry in video_dirs:
+            cached = previous.get(entry.name)
+            if cached and cached[0] == entry.stat().st_mtime_ns:
+                scanned[entry.name] = cached
                 continue
             
-            item = self._extract_video_info(video_dir, channel_dir.name)
-            if item:
-                items.append(item)
+            item = self._extract_video_info(Path(entry.path), channel_dir.name)
+            # Stat after extracting: writing the info sidecar may have touched the folder
+            scanned[entry.name] = [os.stat(entry.path).st_mtime_ns, item]
         
-        # Sort by upload date (newest first)
-        items.sort(key=lambda x: x.get('upload_date', ''), reverse=True)
-        return items[:max_items]
+        return scanned
     
     def _extract_video_info(self, video_dir: Path, channel_name: str) -> Optional[Dict]:
         """Extract video information from directory."""
-        # Look for info.json file
-        info_files = list(video_dir.glob('*.info.json'))
-        if not info_files:
-            return None
+        # Classify the folder's files in a single scandir pass
+        info_file = None
+        media_files = {}
+        with os.scandir(video_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.info.json'):
+                    if info_file is None:
+                        info_file = entry
+                    continue
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in MEDIA_EXTENSION_SET and ext not in media_files:
+                    media_files[ext] = entry
         
-        try:
-            with open(info_files[0], 'r', encoding='utf-8') as f:
-                info = json.load(f)
-        except:
+        # Look for info.json file and the preferred media file
+        if info_file is None or not media_files:
             return None
         
-        # Find media files
-        audio_file = self._find_media_file(video_dir, ['.mp3', '.m4a', '.aac'])
-        video_file = self._find_media_file(video_dir, ['.mp4', '.webm', '.mkv'])
+        media_entry = media_files[next(ext for ext in MEDIA_EXTENSIONS if ext in media_files)]
         
-        if not audio_file and not video_file:
+        info = self._load_video_metadata(video_dir, info_file)
+        if info is None:
             return None
         
-        # Get file stats for pub date
-        media_file = audio_file or video_file
-        file_path = video_dir / media_file
-        pub_date = datetime.fromtimestamp(file_path.stat().st_mtime, timezone.utc)
+        # Get file stats for pub date and size (one stat, reused)
+        media_file = media_entry.name
+        media_stat = media_entry.stat()
+        pub_date = datetime.fromtimestamp(media_stat.st_mtime, timezone.utc)
         
         return {
             'title': info.get('title', video_dir.name),
             'description': info.get('description', '')[:500] + '...' if info.get('description') else '',
             'upload_date': info.get('upload_date', ''),
-            'pub_date': pub_date.strftime('%a, %d %b %Y %H:%M:%S %z'),
+            'pub_date': format_datetime(pub_date, usegmt=True),
             'duration': info.get('duration', 0),
             'channel_name': channel_name,
             'video_path': f"{channel_name}/{video_dir.name}",
             'media_file': media_file,
             'media_url': f"{self.base_url}/media/{channel_name}/{video_dir.name}/{media_file}",
             'webpage_url': info.get('webpage_url', ''),
-            'file_size': file_path.stat().st_size if file_path.exists() else 0
+            'file_size': media_stat.st_size
         }
     
-    def _find_media_file(self, video_dir: Path, extensions: List[str]) -> Optional[str]:
-        """Find media file with given extensions."""
-        for ext in extensions:
-            files = list(video_dir.glob(f'*{ext}'))
-            if files:
-                return files[0].name
-        return None
+    def _load_video_metadata(self, video_dir: Path, info_file: os.DirEntry) -> Optional[Dict]:
+        """Load the info.json fields used for feed items, using a sidecar cache when it is current.
+        
+        Full info.json files are often hundreds of KB, while the fields we need are tiny,
+        so the extracted fields are stored next to it keyed by the info.json mtime.
+        """
+        cache_file = video_dir / INFO_CACHE_FILE
+        source_mtime = info_file.stat().st_mtime_ns
+        
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('source_mtime') == source_mtime:
+                return cached['info']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        
+        try:
+            info = load_json_file(info_file.path)
+        except (OSError, ValueError):
+            return None
+        
+        metadata = {field: info[field] for field in INFO_CACHE_FIELDS if field in info}
+        if isinstance(metadata.get('description'), str):
+            # Only the first 500 characters end up in the feed
+            metadata['description'] = metadata['description'][:500]
+        
+        if self.write_info_cache:
+            def write(tmp_path):
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'source_mtime': source_mtime, 'info': metadata}, f, ensure_ascii=False)
+            
+            try:
+                replace_atomically(cache_file, write)
+            except OSError:
+                pass  # Read-only downloads directory; just skip caching
+        
+        return metadata
     
     def _add_item_to_channel(self, channel: Element, item_data: Dict):
         """Add RSS item to channel."""
@@ -159,32 +272,23 @@ class RSSGenerator:
     
     def _get_mime_type(self, filename: str) -> str:
         """Get MIME type for file."""
-        ext = Path(filename).suffix.lower()
-        mime_types = {
-            '.mp3': 'audio/mpeg',
-            '.m4a': 'audio/mp4',
-            '.aac': 'audio/aac',
-            '.mp4': 'video/mp4',
-            '.webm': 'video/webm',
-            '.mkv': 'video/x-matroska'
-        }
-        return mime_types.get(ext, 'application/octet-stream')
+        ext = os.path.splitext(filename)[1].lower()
+        return MIME_TYPES.get(ext, 'application/octet-stream')
     
     def _format_duration(self, seconds: int) -> str:
         """Format duration for iTunes."""
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
+        hours, remainder = divmod(int(seconds), 3600)
+        minutes, secs = divmod(remainder, 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
     
-    def _empty_feed(self, channel_name: str) -> str:
+    def _empty_feed(self, channel_name: str) -> Element:
         """Generate empty RSS feed."""
         rss = Element('rss', version='2.0')
         channel = SubElement(rss, 'channel')
         SubElement(channel, 'title').text = f"PodcastHarvester - {channel_name}"
         SubElement(channel, 'description').text = f"No content available for {channel_name}"
         SubElement(channel, 'link').text = f"{self.base_url}/channel/{channel_name}"
-        return self._format_xml(rss)
+        return rss
     
     def _format_xml(self, element: Element) -> str:
         """Format XML with proper declaration."""
@@ -192,20 +296,99 @@ class RSSGenerator:
         return f'<?xml version="1.0" encoding="UTF-8"?>\n{xml_str}'
 
 
-def update_rss_feeds(downloads_dir: Path, feeds_dir: Path, base_url: str = "http://localhost:8080"):
+def replace_atomically(path: Path, write):
+    """Call write(tmp_path) and rename the result over `path`.
+    
+    Readers (and concurrent updaters) only ever see a complete old or new file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_feed(element: Element, path: Path):
+    """Write a feed straight to disk as UTF-8, without building the document as a string first."""
+    replace_atomically(path, lambda tmp_path: ET.ElementTree(element).write(
+        tmp_path, encoding='utf-8', xml_declaration=True))
+
+
+def write_items_cache(cache_file: Path, base_url: str, channels: Dict[str, Dict[str, list]]):
+    """Save the per-folder item cache for the next update_rss_feeds run."""
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'base_url': base_url, 'channels': channels}, f, ensure_ascii=False)
+    
+    replace_atomically(cache_file, write)
+
+
+def _scan_channel(args) -> Tuple[Path, Dict[str, list]]:
+    """Worker: scan one channel, reusing unchanged folders (module level so it can be pickled)."""
+    downloads_dir, base_url, channel_dir, previous = args
+    return channel_dir, RSSGenerator(downloads_dir, base_url)._scan_channel_entries(channel_dir, previous)
+
+
+def load_items_cache(cache_file: Path, base_url: str) -> Dict[str, Dict[str, list]]:
+    """Load the per-folder item cache written by the previous update_rss_feeds run."""
+    try:
+        cache = load_json_file(cache_file)
+    except (OSError, ValueError):
+        return {}
+    # Items embed media URLs, so a different base URL invalidates everything
+    if not isinstance(cache, dict) or cache.get('base_url') != base_url:
+        return {}
+    return cache.get('channels', {})
+
+
+def update_rss_feeds(downloads_dir: Path, feeds_dir: Path, base_url: str = "http://localhost:8080",
+                     max_workers: Optional[int] = None):
     """Update all RSS feeds."""
     feeds_dir.mkdir(exist_ok=True)
     generator = RSSGenerator(downloads_dir, base_url)
     
+    channel_dirs = [d for d in downloads_dir.iterdir() if d.is_dir() and not d.name.startswith('.')]
+    
+    # Items from the previous run are reused for video folders that haven't changed
+    cache_file = feeds_dir / ITEMS_CACHE_FILE
+    previous = load_items_cache(cache_file, base_url)
+    tasks = [(downloads_dir, base_url, channel_dir, previous.get(channel_dir.name))
+             for channel_dir in channel_dirs]
+    cached_tasks = [task for task in tasks if task[3] is not None]
+    cold_tasks = [task for task in tasks if task[3] is None]
+    
+    # Cached channels mostly need a stat() per folder, which is cheaper than starting
+    # interpreters, so scan them here. Channels never scanned before parse every
+    # info.json (CPU bound): when there are several, spread them over processes.
+    # Use spawn: we may be called from a worker thread, where fork is unsafe.
+    results = [_scan_channel(task) for task in cached_tasks]
+    if len(cold_tasks) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            results.extend(executor.map(_scan_channel, cold_tasks))
+    else:
+        results.extend(_scan_channel(task) for task in cold_tasks)
+    
+    # Seed the generator's cache, so the feeds below are built without touching the disk again
+    channels_cache = {}
+    for channel_dir, scanned in results:
+        channels_cache[channel_dir.name] = scanned
+        generator.seed_items(channel_dir, scanned)
+    
+    try:
+        write_items_cache(cache_file, base_url, channels_cache)
+    except OSError as e:
+        print(f"⚠️  Could not save RSS item cache: {e}")
+    
     # Generate master feed
-    master_feed = generator.generate_master_feed()
-    (feeds_dir / 'master.xml').write_text(master_feed, encoding='utf-8')
+    write_feed(generator.build_master_feed(), feeds_dir / 'master.xml')
     
     # Generate individual channel feeds
-    for channel_dir in downloads_dir.iterdir():
-        if channel_dir.is_dir() and not channel_dir.name.startswith('.'):
-            channel_feed = generator.generate_channel_feed(channel_dir.name)
-            (feeds_dir / f'{channel_dir.name}.xml').write_text(channel_feed, encoding='utf-8')
+    for channel_dir in channel_dirs:
+        write_feed(generator.build_channel_feed(channel_dir.name), feeds_dir / f'{channel_dir.name}.xml')
     
     print(f"✅ RSS feeds updated in {feeds_dir}")
 
@@ -217,9 +400,14 @@ if __name__ == "__main__":
     parser.add_argument('--downloads-dir', default='downloads', help='Downloads directory')
     parser.add_argument('--feeds-dir', default='feeds', help='RSS feeds output directory')
     parser.add_argument('--base-url', default='http://localhost:8080', help='Base URL for media links')
+    parser.add_argument('--max-workers', type=int, help='Processes used to scan channels (default: CPU count)')
     
     args = parser.parse_args()
     
+    if args.max_workers is not None and args.max_workers < 1:
+        print("Error: --max-workers must be at least 1")
+        exit(1)
+    
     downloads_path = Path(args.downloads_dir)
     feeds_path = Path(args.feeds_dir)
     
@@ -227,4 +415,4 @@ if __name__ == "__main__":
         print(f"Error: Downloads directory {downloads_path} does not exist")
         exit(1)
     
-    update_rss_feeds(downloads_path, feeds_path, args.base_url)
+    update_rss_feeds(downloads_path, feeds_path, args.base_url, args.max_workers)